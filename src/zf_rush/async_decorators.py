@@ -85,7 +85,8 @@ def concurrent(max_concurrent: int, max_requests: int):
 
     装饰器说明：
         该装饰器用于控制并发请求的数量，并确保不会超出允许的最大请求数。
-        它使用 asyncio.Semaphore 来控制并发数，并使用 asyncio.Lock 来确保请求计数的正确性。
+        它使用 asyncio.Semaphore 来控制并发数；请求计数的检查与自增之间没有 await，
+        在单一事件循环内天然原子，无需额外加锁。
         每个并发任务会创建一个 HttpClient 实例，并将其传递给被装饰的函数。
         如果请求失败，将记录错误日志。
     """
@@ -94,7 +95,6 @@ def concurrent(max_concurrent: int, max_requests: int):
         async def wrapper(*args, **kwargs):
             semaphore = asyncio.Semaphore(max_concurrent)
             request_counter = 0
-            lock = asyncio.Lock()
             task_id_counter = 0
 
             async def worker():
@@ -106,11 +106,11 @@ def concurrent(max_concurrent: int, max_requests: int):
                 async with HttpClient() as client:
                     while True:
                         async with semaphore:
-                            async with lock:
-                                if request_counter >= max_requests:
-                                    break
-                                current_request = request_counter
-                                request_counter += 1
+                            # 检查与自增之间无 await，协程间不会交错
+                            if request_counter >= max_requests:
+                                break
+                            current_request = request_counter
+                            request_counter += 1
 
                             # 注入client到被装饰函数
                             try:
@@ -201,24 +201,25 @@ def http_client(
 
         """
 
+        # 使用默认配置防止None，装饰时只创建一次以便识别配置是否变更
+        cc = connection_config or ConnectionConfig()
+        rs = retry_strategy or RetryStrategy()
+        pp = proxy_provider or EmptyProxyProvider()
+
         @wraps(func)
         async def wrapper(*args, **kwargs) -> any:
             # 优先使用外部传入的client
             if "client" in kwargs:
                 client: HttpClient = kwargs["client"]
-                client.connection_config = connection_config
-                client.retry_strategy = retry_strategy
-                client.proxy_provider = (
-                    proxy_provider if proxy_provider else EmptyProxyProvider()
-                )
+                client.retry_strategy = rs
+                if client.connection_config is not cc or client.proxy_provider is not pp:
+                    client.connection_config = cc
+                    client.proxy_provider = pp
+                    # 配置或代理提供器已变更，丢弃按旧配置创建的客户端
+                    await client._close_clients()
                 await client._create_client()
                 return await func(*args, **kwargs)
 
-            # 使用默认配置防止None
-            cc = connection_config or ConnectionConfig()
-            rs = retry_strategy or RetryStrategy()
-            pp = proxy_provider or EmptyProxyProvider()
-
             # 否则创建新client并传递配置参数
             async with HttpClient(
                 connection_config=cc,
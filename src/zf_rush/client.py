@@ -10,6 +10,7 @@
 """
 
 import asyncio
+import functools
 import random
 import ssl
 from typing import Optional, Any, Dict, Tuple, Union
@@ -40,12 +41,75 @@ except ImportError:
 from zf_rush.config import ConnectionConfig, RetryStrategy
 from zf_rush.proxy import EmptyProxyProvider, ProxyProvider
 
+# 预生成的User-Agent数量（2的幂，便于用 getrandbits 取下标）
+_UA_POOL_BITS = 11
+_UA_POOL_SIZE = 1 << _UA_POOL_BITS
+
+# 公网IPv4第一个八位组候选值（排除 0、10、127 及 224-255）
+_VALID_OCTET1 = tuple(i for i in range(1, 224) if i not in (10, 127))
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_ua() -> FakeUserAgent:
+    """
+    获取全局共享的用户代理对象，首次调用时加载数据集，避免每个客户端重复加载。
+
+    Returns:
+        FakeUserAgent: 所有客户端共享的用户代理对象。
+    """
+    return UserAgent()
+
+
+@functools.lru_cache(maxsize=2)
+def _shared_ssl_context(ssl_verify: bool) -> ssl.SSLContext:
+    """
+    获取按 ssl_verify 缓存的共享SSL上下文。
+
+    Args:
+        ssl_verify (bool): 是否启用SSL验证。
+
+    Returns:
+        ssl.SSLContext: 所有客户端共享的SSL上下文。
+    """
+    # 如果SSL验证被禁用
+    if not ssl_verify:
+        # 创建一个默认的SSL上下文，不验证CA证书
+        return ssl.create_default_context(ssl.Purpose.SERVER_AUTH, cafile=False)
+    # 如果SSL验证被启用
+    return httpx.create_ssl_context()
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_ua_pool() -> Tuple[str, ...]:
+    """
+    获取全局共享的User-Agent池，首次调用时生成。
+
+    直接按数据集中的占比一次性加权抽样；逐个调用 ua.random 每次都会重新过滤整个数据集，
+    生成整个池子会阻塞事件循环数秒。
+
+    Returns:
+        Tuple[str, ...]: 预生成的User-Agent字符串。
+    """
+    ua = _shared_ua()
+    data_browsers = getattr(ua, "data_browsers", None)
+    if data_browsers:
+        user_agents = [item["useragent"] for item in data_browsers]
+        weights = [item.get("percent") or 0 for item in data_browsers]
+        return tuple(
+            random.choices(user_agents, weights=weights if any(weights) else None, k=_UA_POOL_SIZE)
+        )
+    # 未安装 fake-useragent 时的占位实现没有数据集
+    return tuple(ua.random for _ in range(_UA_POOL_SIZE))
+
 
 class HttpClient:
     """
     HTTP客户端类，用于发送请求和处理响应。
     """
 
+    # 触发重试的网络层异常类型，类级别共享；可重试的状态码由 RetryStrategy 配置
+    RETRY_EXCEPTIONS: Tuple[type, ...] = (httpx.RequestError,)
+
     def __init__(
         self,
         connection_config: Optional["ConnectionConfig"] = None,
@@ -69,8 +133,8 @@ class HttpClient:
             fake_headers (bool): 是否使用伪造头部信息。
             ua ("UserAgent"): 用户代理对象。
             current_proxy (Any): 当前使用的代理。
-            _client (Optional[httpx.AsyncClient]): HTTPX异步客户端对象。
-            _ssl_context (SSLContext): SSL上下文对象。
+            _client (Optional[httpx.AsyncClient]): 当前代理对应的HTTPX异步客户端对象。
+            _clients (Dict[Optional[str], httpx.AsyncClient]): 按代理地址缓存的客户端（按最近使用排序），每个代理保留各自的连接池。
         """
         # 提供默认配置
         # 设置连接配置对象
@@ -83,41 +147,63 @@ class HttpClient:
         self.fake_headers: bool = fake_headers
 
         # 初始化用户代理对象
-        self.ua: FakeUserAgent = UserAgent()
+        self.ua: FakeUserAgent = _shared_ua()
         # 初始化当前使用的代理为空
         self.current_proxy: tuple[Optional[str], Optional[Exception]] = None
         # 初始化HTTPX异步客户端对象为None
         self._client: Optional[httpx.AsyncClient] = None
-        # 初始化SSL上下文对象
-        self._ssl_context: ssl.SSLContext = self._create_ssl_context()
+        # 按代理地址缓存的客户端，避免轮换代理时重建连接池
+        self._clients: Dict[Optional[str], httpx.AsyncClient] = {}
 
     async def __aenter__(self) -> "HttpClient":
-        self._client = await self._create_client()
+        await self._create_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._client:
-            await self._client.aclose()
-
-    def _create_ssl_context(self) -> ssl.SSLContext:
-        # 确保配置存在
-        # 如果SSL验证被禁用
-        if not self.connection_config.ssl_verify:
-            # 创建一个默认的SSL上下文，不验证CA证书
-            return ssl.create_default_context(ssl.Purpose.SERVER_AUTH, cafile=False)
-        # 如果SSL验证被启用
-        return httpx.create_ssl_context()
+        await self._close_clients()
+
+    async def _close_clients(self) -> None:
+        """
+        关闭所有缓存的客户端并清空缓存。
+        """
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._client = None
+        if clients:
+            await asyncio.gather(*(client.aclose() for client in clients))
 
     async def _create_client(self) -> httpx.AsyncClient:
         """
-        异步创建 httpx 异步客户端。
+        异步获取新代理，并切换到该代理对应的 httpx 异步客户端。
 
         Args:
             无
 
         Returns:
-            httpx.AsyncClient: 创建的 httpx 异步客户端实例。
+            httpx.AsyncClient: 当前代理对应的 httpx 异步客户端实例。
+
+        """
+        proxy = await self._rotate_proxy()
+        self._client = self._get_client(proxy)
+        await self._evict_clients()
+        return self._client
 
+    async def _evict_clients(self) -> None:
+        """
+        缓存的客户端超过 max_proxy_clients 时，关闭最久未使用的客户端。
+        """
+        max_clients = max(1, self.connection_config.max_proxy_clients)
+        while len(self._clients) > max_clients:
+            # dict保持插入顺序，最早的键即最久未使用
+            oldest_proxy = next(iter(self._clients))
+            await self._clients.pop(oldest_proxy).aclose()
+
+    async def _rotate_proxy(self) -> Optional[str]:
+        """
+        从代理提供器获取新代理并更新 current_proxy。
+
+        Returns:
+            Optional[str]: 可用的代理地址，获取失败或不使用代理时为None。
         """
         # 获取代理服务器
         if self.proxy_provider:
@@ -131,21 +217,45 @@ class HttpClient:
         else:
             self.current_proxy = (None, None)
             proxy = None
+        return proxy
+
+    def _get_client(self, proxy: Optional[str]) -> httpx.AsyncClient:
+        """
+        获取指定代理对应的客户端，不存在时创建并缓存。
+
+        Args:
+            proxy (Optional[str]): 代理地址，None表示直连。
+
+        Returns:
+            httpx.AsyncClient: 该代理对应的 httpx 异步客户端实例。
+        """
+        client = self._clients.pop(proxy, None)
+        if client is not None:
+            # 重新插入以标记为最近使用
+            self._clients[proxy] = client
+            return client
 
         # 创建httpx异步客户端
-        self._client = httpx.AsyncClient(
+        client = httpx.AsyncClient(
             # 设置超时时间
             timeout=self.connection_config.timeout,
             # 是否启用HTTP/2
             http2=self.connection_config.http2,
             # SSL上下文，用于HTTPS连接
-            verify=self._ssl_context,
+            verify=_shared_ssl_context(self.connection_config.ssl_verify),
+            # 连接池上限，避免高并发时受httpx默认值限制
+            limits=httpx.Limits(
+                max_connections=self.connection_config.max_connections,
+                max_keepalive_connections=self.connection_config.max_keepalive_connections,
+                keepalive_expiry=self.connection_config.keepalive_expiry,
+            ),
             # 代理服务器
             proxy=proxy,
         )
+        self._clients[proxy] = client
 
         # 返回创建的客户端
-        return self._client
+        return client
 
     def _random_ip(self) -> str:
         """
@@ -158,35 +268,30 @@ class HttpClient:
             str: 一个随机的公网IPv4地址。
 
         """
-        while True:
-            # 生成第一个八位组（1-254）
-            octet1 = random.randint(1, 254)
-
-            # 排除特殊地址段
-            if octet1 in {10, 127} or 224 <= octet1 <= 255:
-                continue
-
-            # 生成第二个八位组
-            octet2 = random.randint(0, 255)
-            if octet1 == 172:
-                # 排除私有地址段 172.16.0.0 - 172.31.255.255
-                if 16 <= octet2 <= 31:
-                    continue
-            elif octet1 == 192:
-                # 排除私有地址段 192.168.0.0/16
-                if octet2 == 168:
-                    continue
-
-            # 生成第三、第四个八位组
-            octet3 = random.randint(0, 255)
-            octet4 = random.randint(0, 255)
-
-            # 检查是否为链路本地地址（169.254.0.0/16）
-            if octet1 == 169 and octet2 == 254:
-                continue
-
-            # 拼接生成的IPv4地址并返回
-            return f"{octet1}.{octet2}.{octet3}.{octet4}"
+        # 直接从合法候选值中抽取第一个八位组，无需拒绝重试
+        octet1 = random.choice(_VALID_OCTET1)
+        octet2 = random.getrandbits(8)
+
+        # 仅对包含保留子网的地址段重新抽取第二个八位组
+        if octet1 == 172:
+            # 排除私有地址段 172.16.0.0 - 172.31.255.255
+            while 16 <= octet2 <= 31:
+                octet2 = random.getrandbits(8)
+        elif octet1 == 192:
+            # 排除私有地址段 192.168.0.0/16
+            while octet2 == 168:
+                octet2 = random.getrandbits(8)
+        elif octet1 == 169:
+            # 排除链路本地地址 169.254.0.0/16
+            while octet2 == 254:
+                octet2 = random.getrandbits(8)
+
+        # 生成第三、第四个八位组
+        octet3 = random.getrandbits(8)
+        octet4 = random.getrandbits(8)
+
+        # 拼接生成的IPv4地址并返回
+        return f"{octet1}.{octet2}.{octet3}.{octet4}"
 
     def _generate_fake_headers(self) -> dict:
         """
@@ -204,13 +309,18 @@ class HttpClient:
         if not self.fake_headers:
             # 如果没有配置伪造请求头，返回空字典
             return {}
+        forwarded_ip = self._random_ip()
+        # 由同一地址派生第二个IP，仅扰动最后一个八位组，同一网段仍为公网地址
+        prefix, _, last_octet = forwarded_ip.rpartition(".")
+        real_ip = f"{prefix}.{int(last_octet) ^ random.getrandbits(8)}"
         return {
             # 伪造X-Forwarded-For头
-            "X-Forwarded-For": self._random_ip(),
+            "X-Forwarded-For": forwarded_ip,
             # 伪造X-Real-IP头
-            "X-Real-IP": self._random_ip(),
+            "X-Real-IP": real_ip,
             # 伪造User-Agent头
-            "User-Agent": self.ua.random,
+            # User-Agent池在首次生成伪造请求头时创建，未启用伪造请求头时不会生成
+            "User-Agent": _shared_ua_pool()[random.getrandbits(_UA_POOL_BITS)],
             # 可扩展其他安全头
         }
 
@@ -227,13 +337,13 @@ class HttpClient:
             httpx.Response: 成功响应对象
 
         Raises:
-            httpx.HTTPStatusError: 当达到最大重试次数后仍返回错误状态码
+            httpx.HTTPStatusError: 返回不可重试的错误状态码，或达到最大重试次数后仍返回错误状态码
             httpx.RequestError: 当发生无法恢复的请求错误
 
         功能特性：
-        1. 自动重试机制（基于配置的重试策略）
+        1. 自动重试机制（基于配置的重试策略及可重试状态码）
         2. 智能代理轮换（当配置代理提供者时）
-        3. 伪造请求头注入
+        3. 伪造请求头注入（调用方传入的同名请求头优先）
         4. 指数退避算法优化重试间隔
         5. 自动重建失效的HTTP会话
 
@@ -245,7 +355,9 @@ class HttpClient:
             timeout=30.0
         )
         """
-        headers = {**kwargs.get("headers", {}), **self._generate_fake_headers()}
+        # 伪造请求头在前，调用方显式传入的请求头优先；httpx.Headers 对请求头名大小写不敏感
+        headers = httpx.Headers(self._generate_fake_headers())
+        headers.update(kwargs.get("headers") or {})
         kwargs["headers"] = headers
 
         for attempt in range(self.retry_strategy.max_retries + 1):
@@ -254,38 +366,51 @@ class HttpClient:
                 response = await self._client.request(method, url, **kwargs)
                 # elapsed = time.time() - start_time
                 # logger.info(f"{response.url} 请求耗时: {elapsed:.2f}s")
-                response.raise_for_status()
-                return response
-            except (httpx.RequestError, httpx.HTTPStatusError) as e:
+            except self.RETRY_EXCEPTIONS as e:
                 if attempt < self.retry_strategy.max_retries:
                     await self._handle_retry(exception=e, attempt=attempt)
                     continue
                 raise e
 
-    async def _handle_retry(self, exception: Exception, attempt: int):
+            # 可重试状态码直接进入重试分支，不构造异常
+            if (
+                response.status_code in self.retry_strategy.retry_status_codes
+                and attempt < self.retry_strategy.max_retries
+            ):
+                logger.warning(f"{response.url} 返回状态码 {response.status_code}，准备重试")
+                await self._handle_retry(exception=None, attempt=attempt)
+                continue
+
+            response.raise_for_status()
+            return response
+
+    async def _handle_retry(self, exception: Optional[Exception], attempt: int):
         """重试处理逻辑
 
         Args：
-            exception: 捕获的异常对象
+            exception: 捕获的异常对象，因可重试状态码触发时为None
             attempt: 当前重试次数（从0开始计数）
 
         处理流程：
         1. 代理失效处理
         2. 计算退避时间
-        3. 重建HTTP客户端
+        3. 切换代理及对应的HTTP客户端
         """
         # 如果代理提供器存在且捕获的异常是代理错误
         if self.proxy_provider and isinstance(exception, httpx.ProxyError):
-            # 如果客户端的代理已设置，则进行代理失效处理
-            if self._client.proxy:  # 防止proxy未设置的情况
-                await self.proxy_provider.invalidate_proxy(self._client.proxy)
+            proxy = self.current_proxy[0] if self.current_proxy else None
+            # 如果当前代理已设置，则进行代理失效处理
+            if proxy:  # 防止proxy未设置的情况
+                await self.proxy_provider.invalidate_proxy(proxy)
+                # 失效代理的连接池不再复用
+                stale_client = self._clients.pop(proxy, None)
+                if stale_client is not None:
+                    await stale_client.aclose()
 
         # 指数退避策略
         backoff_time = self.retry_strategy.backoff_factor * (2**attempt)
         logger.debug(f"等待 {backoff_time:.2f}s 后重试（第{attempt + 1}次重试）")
         await asyncio.sleep(backoff_time)
 
-        # 关闭当前客户端
-        await self._client.aclose()
-        # 重建客户端
-        self._client = await self._create_client()
+        # 切换代理，复用该代理已有的连接池
+        await self._create_client()
@@ -37,7 +37,10 @@ class ConnectionConfig:
 
     timeout: float = 10.0
     ssl_verify: bool = False
-    max_connections: int = 100
+    max_connections: int = 1000
+    max_keepalive_connections: int = 100
+    keepalive_expiry: float = 30.0
+    max_proxy_clients: int = 8
     http2: bool = True
 
 
@@ -46,5 +49,5 @@ class RetryStrategy:
     """重试策略配置"""
 
     max_retries: int = 3
-    retry_status_codes: set = frozenset({429, 500, 502, 503, 504})
+    retry_status_codes: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
     backoff_factor: float = 0.5
@@ -9,7 +9,11 @@
 - YiProxyProvider: 易代理实现，从易代理API获取代理
 """
 
+import asyncio
+import re
+import time
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import Optional, Tuple, List, Any
 
 try:
@@ -17,6 +21,26 @@ try:
 except ImportError:
     raise ImportError("httpx is required. Please install it with 'pip install httpx'")
 
+# 代理地址格式：IP:PORT（仅限ASCII数字）
+_PROXY_RE = re.compile(r"([0-9]{1,3})\.([0-9]{1,3})\.([0-9]{1,3})\.([0-9]{1,3}):([0-9]{1,5})")
+
+
+def _is_valid_proxy(address: str) -> bool:
+    """
+    校验代理地址是否为合法的 IP:PORT 格式。
+
+    Args:
+        address (str): 待校验的代理地址，不含协议前缀。
+
+    Returns:
+        bool: 格式、IP各段及端口范围均合法时返回True。
+    """
+    match = _PROXY_RE.fullmatch(address)
+    if match is None:
+        return False
+    *octets, port = match.groups()
+    return all(int(octet) <= 255 for octet in octets) and 1 <= int(port) <= 65535
+
 
 # 代理接口
 class ProxyProvider(ABC):
@@ -144,24 +168,49 @@ class RotatingProxyProvider(ProxyProvider):
 # 易代理实现
 # 官网：https://www.ydaili.cn/
 class YiProxyProvider(ProxyProvider):
-    def __init__(self, link: str):
+    def __init__(self, link: str, batch_size: int = 1, max_age: Optional[float] = 60.0):
         """
         初始化代理类实例。
 
         Args:
             link (str): 代理服务器的链接。
+            batch_size (int, optional): 缓存耗尽时并发预取的代理数量。默认为1，即按需逐个获取，不使用缓存。
+            max_age (Optional[float], optional): 预取代理的最长缓存时间（秒），须为正数，超时的代理会被丢弃。None表示不过期。默认为60秒。
 
         Attributes:
             proxy_link (str): 存储传入的代理链接。
+            batch_size (int): 每次并发预取的代理数量。
+            max_age (Optional[float]): 预取代理的最长缓存时间（秒）。
+            _prefetched (deque[Tuple[str, float]]): 已预取、尚未使用的代理及其获取时间。
+            _refill_lock (asyncio.Lock): 保证同一时间只有一次批量预取。
             _client (httpx.AsyncClient): 初始化一个异步的 HTTP 客户端。
+
+        Raises:
+            ValueError: 如果 batch_size 小于1，或 max_age 不为None且不是正数。
         """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_age is not None and max_age <= 0:
+            raise ValueError("max_age must be positive or None")
         self.proxy_link = link
-        self._client = httpx.AsyncClient()  # 初始化持久化客户端
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self._prefetched: deque[Tuple[str, float]] = deque()
+        self._refill_lock = asyncio.Lock()
+        # 初始化持久化客户端，保持长连接以复用TCP/TLS握手
+        self._client = httpx.AsyncClient(
+            timeout=5,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=2),
+        )
 
     async def get_proxy(self) -> tuple[Optional[str], Optional[Exception]]:
         """
         异步获取代理服务器地址。
 
+        batch_size 为1时直接请求代理链接。否则优先使用预取缓存中未过期的代理，
+        缓存为空时由单个调用方并发请求 batch_size 个代理填充缓存，其余调用方等待其结果。
+
         Args:
             无
 
@@ -173,12 +222,66 @@ class YiProxyProvider(ProxyProvider):
         """
         if not self.proxy_link:
             return None, ValueError("Proxy link is empty.")
+        if self.batch_size == 1:
+            return await self._fetch_proxy()
+
+        proxy = self._pop_prefetched()
+        if proxy:
+            return proxy, None
+
+        error: Optional[Exception] = None
+        # 有意在批量请求期间持有锁：缓存为空时的调用方本就需要等待新代理，
+        # 串行化填充可避免并发调用方各自发起 batch_size 次计费请求。
+        # 缓存命中及 batch_size 为1时均不经过此锁。
+        async with self._refill_lock:
+            # 等待锁期间其他调用方可能已完成填充
+            proxy = self._pop_prefetched()
+            if proxy:
+                return proxy, None
+
+            results = await asyncio.gather(*(self._fetch_proxy() for _ in range(self.batch_size)))
+            fetched_at = time.monotonic()
+            for fetched_proxy, proxy_error in results:
+                if proxy_error is None:
+                    self._prefetched.append((fetched_proxy, fetched_at))
+                else:
+                    error = proxy_error
+            proxy = self._pop_prefetched()
+
+        if proxy:
+            return proxy, None
+        return None, error or ValueError("No proxy available.")
+
+    def _pop_prefetched(self) -> Optional[str]:
+        """
+        取出最早预取且未过期的代理，过期的代理直接丢弃。
+
+        Returns:
+            Optional[str]: 可用的代理地址，缓存中没有可用代理时返回None。
+        """
+        now = time.monotonic()
+        while self._prefetched:
+            proxy, fetched_at = self._prefetched.popleft()
+            if self.max_age is None or now - fetched_at <= self.max_age:
+                return proxy
+        return None
+
+    async def _fetch_proxy(self) -> tuple[Optional[str], Optional[Exception]]:
+        """
+        从代理链接获取单个代理。
+
+        Returns:
+            tuple: 代理地址和可能的异常，格式同 get_proxy。
+        """
         try:
             # start_time = time.time()
-            resp = await self._client.get(self.proxy_link, timeout=5)
+            resp = await self._client.get(self.proxy_link)
             # elapsed = time.time() - start_time
             # logger.info(f"获取代理耗时: {elapsed:.2f}秒")
-            return f"http://{resp.text.strip()}", None
+            address = resp.text.strip()
+            if not _is_valid_proxy(address):
+                return None, ValueError(f"Invalid proxy returned: {address!r}")
+            return f"http://{address}", None
         except (httpx.RequestError, httpx.HTTPStatusError, IOError, ValueError, TimeoutError) as e:
             return None, e
 